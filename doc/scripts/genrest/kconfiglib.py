@@ -680,7 +680,9 @@ class Config(object):
             elif t0 == T_SOURCE:
                 kconfig_file = tokens.get_next()
                 exp_kconfig_file = self._expand_sym_refs(kconfig_file)
-                g = glob.glob(self.base_dir + exp_kconfig_file)
+                # Sort like the C implementation, which Zephyr runs with
+                # LC_COLLATE=C, so that the order of the items is the same
+                g = sorted(glob.glob(self.base_dir + exp_kconfig_file))
                 for s in g:
                     f = os.path.join(s)
                     if not os.path.exists(f):
@@ -824,6 +826,7 @@ class Config(object):
         new_prompt = None
         new_def_exprs = []
         new_selects = []
+        new_ranges = []
 
         # Dependencies from 'depends on' statements
         depends_on_expr = None
@@ -932,11 +935,11 @@ class Config(object):
                 stmt.referenced_syms.add(high)
 
                 if tokens.check(T_IF):
-                    stmt.ranges.append((low, high,
-                                        self._parse_expr(tokens, stmt, line,
-                                                         filename, linenr)))
+                    new_ranges.append((low, high,
+                                       self._parse_expr(tokens, stmt, line,
+                                                        filename, linenr)))
                 else:
-                    stmt.ranges.append((low, high, None))
+                    new_ranges.append((low, high, None))
 
             elif t0 == T_DEF_TRISTATE:
                 stmt.type = TRISTATE
@@ -1070,6 +1073,18 @@ class Config(object):
             stmt.def_exprs.extend([(val_expr, _make_and(cond_expr, deps))
                                    for val_expr, cond_expr in new_def_exprs])
 
+            # Propagate dependencies to ranges, like the C implementation
+            # does, so that ranges from other definitions of the symbol
+            # (e.g. in an 'if' for another SoC) don't apply
+
+            # Only symbols have ranges
+            if isinstance(stmt, Symbol):
+                stmt.ranges.extend([(low, high,
+                                     _make_and(_make_and(cond_expr,
+                                                         depends_on_expr),
+                                               deps))
+                                    for low, high, cond_expr in new_ranges])
+
             # Propagate dependencies to selects
 
             # Only symbols can select
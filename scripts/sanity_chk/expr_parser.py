@@ -7,6 +7,7 @@
 import sys
 import os
 import copy
+import functools
 import threading
 import re
 
@@ -206,12 +207,330 @@ def ast_expr(ast, env):
     elif ast[0] == ":":
         return True if re.compile(ast[2]).match(ast_sym(ast[1], env)) else False
 
+_missing = object()
+
+def _sym_fn(name):
+    def sym(env):
+        v = env.get(name, _missing)
+        if v is _missing:
+            return ""
+        return v if v.__class__ is str else str(v)
+    return sym
+
+def _sym_int_fn(name):
+    def sym_int(env):
+        v = env.get(name, _missing)
+        if v is _missing:
+            return 0
+        if v.startswith("0x") or v.startswith("0X"):
+            return int(v, 16)
+        return int(v, 10)
+    return sym_int
+
+def _compile_ast(ast):
+    """Turn an AST into a function of the environment
+
+    The result behaves exactly like ast_expr(ast, env), but the tree is
+    only walked once: constants are converted and regular expressions are
+    compiled up front and bound into nested closures."""
+    op = ast[0]
+    if op == "not":
+        operand = _compile_ast(ast[1])
+        return lambda env: not operand(env)
+    elif op == "or":
+        left = _compile_ast(ast[1])
+        right = _compile_ast(ast[2])
+        return lambda env: left(env) or right(env)
+    elif op == "and":
+        left = _compile_ast(ast[1])
+        right = _compile_ast(ast[2])
+        return lambda env: left(env) and right(env)
+    elif op == "exists":
+        sym = _sym_fn(ast[1])
+        return lambda env: True if sym(env) else False
+
+    sym = _sym_fn(ast[1])
+    sym_int = _sym_int_fn(ast[1])
+    if op == "==":
+        value = ast[2]
+        return lambda env: sym(env) == value
+    elif op == "!=":
+        value = ast[2]
+        return lambda env: sym(env) != value
+    elif op == ">":
+        value = int(ast[2])
+        return lambda env: sym_int(env) > value
+    elif op == "<":
+        value = int(ast[2])
+        return lambda env: sym_int(env) < value
+    elif op == ">=":
+        value = int(ast[2])
+        return lambda env: sym_int(env) >= value
+    elif op == "<=":
+        value = int(ast[2])
+        return lambda env: sym_int(env) <= value
+    elif op == "in":
+        values = frozenset(ast[2])
+        return lambda env: sym(env) in values
+    elif op == ":":
+        match = _matcher(ast[2])
+        return lambda env: True if match(sym(env)) else False
+    return lambda env: None
+
+def _matcher(pattern):
+    """Get a function matching strings against a regular expression
+
+    The expression is only compiled on first use, so that an invalid one
+    only raises re.error when a term using it is evaluated, like with
+    ast_expr()."""
+    match = None
+    def matcher(v):
+        nonlocal match
+        if match is None:
+            match = re.compile(pattern).match
+        return match(v)
+    return matcher
+
+def _to_int(v):
+    if v.startswith("0x") or v.startswith("0X"):
+        return int(v, 16)
+    return int(v, 10)
+
+def _compile_vector(ast):
+    """Turn an AST into a function evaluating it on rows of a SymbolTable
+
+    The returned function takes a table and a list of row indexes and
+    returns the list of results for those rows. Operands of 'and'/'or'
+    are only evaluated on the rows which need them, so every row sees the
+    same short-circuit behaviour as with Expression.evaluate()."""
+    op = ast[0]
+    if op == "not":
+        operand = _compile_vector(ast[1])
+        return lambda table, rows: [not v for v in operand(table, rows)]
+    elif op in ("or", "and"):
+        left = _compile_vector(ast[1])
+        right = _compile_vector(ast[2])
+        need_right = (op == "and")
+        def logical(table, rows):
+            results = left(table, rows)
+            pending = [i for i, v in enumerate(results) if bool(v) == need_right]
+            if pending:
+                sub = right(table, [rows[i] for i in pending])
+                for i, v in zip(pending, sub):
+                    results[i] = v
+            return results
+        return logical
+
+    name = ast[1]
+    if op == "exists":
+        return lambda table, rows: [True if table.strings(name)[r] else False
+                                    for r in rows]
+    elif op in ("==", "!=", "in", ":"):
+        if op == "==":
+            value = ast[2]
+            test = lambda v: v == value
+        elif op == "!=":
+            value = ast[2]
+            test = lambda v: v != value
+        elif op == "in":
+            values = frozenset(ast[2])
+            test = lambda v: v in values
+        else:
+            match = _matcher(ast[2])
+            test = lambda v: True if match(v) else False
+        def compare_str(table, rows):
+            column = table.strings(name)
+            return [test(column[r]) for r in rows]
+        return compare_str
+    elif op in (">", "<", ">=", "<="):
+        value = int(ast[2])
+        if op == ">":
+            test = lambda v: v > value
+        elif op == "<":
+            test = lambda v: v < value
+        elif op == ">=":
+            test = lambda v: v >= value
+        else:
+            test = lambda v: v <= value
+        def compare_int(table, rows):
+            column = table.values(name)
+            return [test(0 if column[r] is None else _to_int(column[r]))
+                    for r in rows]
+        return compare_int
+    return lambda table, rows: [None for r in rows]
+
+class SymbolTable:
+    """Columnar environment to evaluate an expression on many rows at once
+
+    Each row is one environment (e.g. one platform's defconfig), each
+    column the values of one symbol across all rows. A cell set to None
+    means the symbol isn't defined in that row, in which case the value
+    comes from the base environment shared by all rows. This gives the
+    same result as evaluating each row against a copy of the base
+    environment updated with the row's values, without making the copies.
+
+    Columns are only materialized for the symbols an expression looks at.
+    """
+
+    def __init__(self, nrows, base=None, rows=None):
+        """Constructor
+
+        @param nrows Number of rows in the table
+        @param base Dictionary of values shared by all rows, or None
+        @param rows Optional list of nrows dictionaries from which columns
+            not given with set_column() are extracted on demand
+        """
+        self.nrows = nrows
+        self.base = base if base is not None else {}
+        self.rows = rows
+        self._columns = {}
+        self._resolved = {}
+        self._strings = {}
+
+    def set_column(self, name, values):
+        """Set the values of a symbol for every row
+
+        @param name Symbol name
+        @param values List of nrows values, None where the symbol is not
+            defined in that row
+        """
+        if len(values) != self.nrows:
+            raise ValueError("column %s has %d rows, expected %d" %
+                             (name, len(values), self.nrows))
+        self._columns[name] = list(values)
+        self._resolved.pop(name, None)
+        self._strings.pop(name, None)
+
+    def values(self, name):
+        """Get the effective values of a symbol, None where undefined"""
+        if name in self._resolved:
+            return self._resolved[name]
+
+        if name in self._columns:
+            column = self._columns[name]
+        elif self.rows is not None:
+            column = [row.get(name) for row in self.rows]
+        else:
+            column = [None] * self.nrows
+
+        fallback = self.base.get(name)
+        if fallback is not None:
+            column = [fallback if v is None else v for v in column]
+        column = [v if v is None or v.__class__ is str else str(v)
+                  for v in column]
+        self._resolved[name] = column
+        return column
+
+    def strings(self, name):
+        """Get the values of a symbol as strings, "" where undefined"""
+        if name not in self._strings:
+            self._strings[name] = ["" if v is None else v
+                                   for v in self.values(name)]
+        return self._strings[name]
+
+def ast_symbols(ast):
+    """Get the set of symbols an AST refers to"""
+    if ast[0] in ("not",):
+        return ast_symbols(ast[1])
+    elif ast[0] in ("or", "and"):
+        return ast_symbols(ast[1]) | ast_symbols(ast[2])
+    return frozenset([ast[1]])
+
+def ast_partial(ast, env, unknown):
+    """Evaluate an AST when the values of some symbols aren't known yet
+
+    Uses three-valued logic: the result is True or False if it holds
+    whatever the values of the unknown symbols turn out to be, None if
+    it depends on them.
+
+    Raises ValueError like ast_expr() where the full evaluation would,
+    whatever the unknown symbols turn out to be."""
+    if ast[0] == "not":
+        v = ast_partial(ast[1], env, unknown)
+        return None if v is None else not v
+    elif ast[0] in ("or", "and"):
+        decisive = (ast[0] == "or")
+        left = ast_partial(ast[1], env, unknown)
+        if left is decisive:
+            return decisive
+        try:
+            right = ast_partial(ast[2], env, unknown)
+        except ValueError:
+            if left is None:
+                # Only evaluated if the unknown symbols let it be
+                return None
+            raise
+        if right is decisive:
+            return decisive
+        if left is None or right is None:
+            return None
+        return not decisive
+    elif ast[1] in unknown:
+        return None
+
+    return True if ast_expr(ast, env) else False
+
 mutex = threading.Lock()
 
-def parse(expr_text, env):
+def _freeze(ast):
+    if isinstance(ast, (list, tuple)):
+        return tuple(_freeze(node) for node in ast)
+    return ast
+
+class Expression:
+    """A compiled filter expression
+
+    Instances are immutable and hold no parser state, so a single
+    expression can be evaluated against any number of environments,
+    from any number of threads, without locking.
+    """
+    __slots__ = ("text", "ast", "symbols", "_fn", "_vector_fn")
+
+    def __init__(self, text, ast):
+        object.__setattr__(self, "text", text)
+        object.__setattr__(self, "ast", _freeze(ast))
+        object.__setattr__(self, "symbols", ast_symbols(self.ast))
+        object.__setattr__(self, "_fn", _compile_ast(self.ast))
+        object.__setattr__(self, "_vector_fn", _compile_vector(self.ast))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Expression objects are immutable")
+
+    def __repr__(self):
+        return "<Expression %r>" % self.text
+
+    def evaluate(self, env):
+        """Use the provided environment to determine whether the
+        expression is true or false"""
+        return self._fn(env)
+
+    def evaluate_partial(self, env, unknown):
+        """Try to determine the value of the expression without knowing
+        the values of some of the symbols it refers to
+
+        @param env Environment with the values known so far
+        @param unknown Collection of symbol names whose value isn't known
+            yet; their entries in env, if any, are ignored
+        @return True or False if the expression has that value whatever
+            the unknown symbols are set to, None otherwise
+        """
+        return ast_partial(self.ast, env, frozenset(unknown))
+
+    def evaluate_table(self, table):
+        """Evaluate the expression on every row of a SymbolTable
+
+        @param table SymbolTable object
+        @return list of booleans, one per row
+        """
+        return self._vector_fn(table, list(range(table.nrows)))
+
+@functools.lru_cache(maxsize=1024)
+def compile(expr_text):
     """Given a text representation of an expression in our language,
-    use the provided environment to determine whether the expression
-    is true or false"""
+    return an Expression object which can be evaluated repeatedly.
+
+    Results are cached on the expression text, so compiling the same
+    filter again is only a dictionary lookup."""
 
     # Like it's C counterpart, state machine is not thread-safe
     mutex.acquire()
@@ -220,7 +539,14 @@ def parse(expr_text, env):
     finally:
         mutex.release()
 
-    return ast_expr(ast, env)
+    return Expression(expr_text, ast)
+
+def parse(expr_text, env):
+    """Given a text representation of an expression in our language,
+    use the provided environment to determine whether the expression
+    is true or false"""
+
+    return compile(expr_text).evaluate(env)
 
 # Just some test code
 if __name__ == "__main__":
@@ -17,6 +17,7 @@
 
 #include "timestamp.h"
 #include "utils.h"
+#include <tc_util.h>
 
 #include <arch/cpu.h>
 
@@ -113,6 +114,9 @@ int coop_ctx_switch(void)
 			     timestamp / ctx_switch_counter,
 			     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
 							   ctx_switch_counter));
+		TC_PRINT_METRIC(coop_ctx_switch_ns,
+				SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
+							      ctx_switch_counter));
 	}
 
 	return 0;
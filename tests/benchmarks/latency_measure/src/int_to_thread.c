@@ -14,6 +14,7 @@
 
 #include "timestamp.h"
 #include "utils.h"
+#include <tc_util.h>
 
 #include <arch/cpu.h>
 #include <irq_offload.h>
@@ -73,6 +74,8 @@ int int_to_thread(void)
 	if (flag_var == 1) {
 		PRINT_FORMAT(" switching time is %u tcs = %u nsec",
 			     timestamp, SYS_CLOCK_HW_CYCLES_TO_NS(timestamp));
+		TC_PRINT_METRIC(int_to_thread_ns,
+				SYS_CLOCK_HW_CYCLES_TO_NS(timestamp));
 	}
 	return 0;
 }
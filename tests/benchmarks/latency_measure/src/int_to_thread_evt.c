@@ -18,6 +18,7 @@
 
 #include "timestamp.h"
 #include "utils.h"
+#include <tc_util.h>
 
 #include <arch/cpu.h>
 
@@ -81,5 +82,7 @@ int int_to_thread_evt(void)
 	timestamp = TIME_STAMP_DELTA_GET(timestamp);
 	PRINT_FORMAT(" switch time is %u tcs = %u nsec",
 		     timestamp, SYS_CLOCK_HW_CYCLES_TO_NS(timestamp));
+	TC_PRINT_METRIC(int_to_thread_evt_ns,
+			SYS_CLOCK_HW_CYCLES_TO_NS(timestamp));
 	return 0;
 }
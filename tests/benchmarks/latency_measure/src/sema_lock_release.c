@@ -17,6 +17,7 @@
 
 #include "timestamp.h"
 #include "utils.h"
+#include <tc_util.h>
 
 #include <arch/cpu.h>
 
@@ -58,6 +59,9 @@ int sema_lock_unlock(void)
 			     timestamp / N_TEST_SEMA,
 			     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
 							   N_TEST_SEMA));
+		TC_PRINT_METRIC(sema_give_ns,
+				SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
+							      N_TEST_SEMA));
 	} else {
 		error_count++;
 		PRINT_OVERFLOW_ERROR();
@@ -75,6 +79,9 @@ int sema_lock_unlock(void)
 			     timestamp / N_TEST_SEMA,
 			     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
 							   N_TEST_SEMA));
+		TC_PRINT_METRIC(sema_take_ns,
+				SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
+							      N_TEST_SEMA));
 	} else {
 		error_count++;
 		PRINT_OVERFLOW_ERROR();
@@ -105,6 +112,8 @@ int mutex_lock_unlock(void)
 	PRINT_FORMAT(" Average time to lock the mutex %u tcs = %u nsec",
 		     timestamp / N_TEST_MUTEX,
 		     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp, N_TEST_MUTEX));
+	TC_PRINT_METRIC(mutex_lock_ns,
+			SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp, N_TEST_MUTEX));
 	timestamp = TIME_STAMP_DELTA_GET(0);
 	for (i = 0; i < N_TEST_MUTEX; i++) {
 		k_mutex_unlock(&TEST_MUTEX);
@@ -113,5 +122,7 @@ int mutex_lock_unlock(void)
 	PRINT_FORMAT(" Average time to unlock the mutex %u tcs = %u nsec",
 		     timestamp / N_TEST_MUTEX,
 		     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp, N_TEST_MUTEX));
+	TC_PRINT_METRIC(mutex_unlock_ns,
+			SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp, N_TEST_MUTEX));
 	return 0;
 }
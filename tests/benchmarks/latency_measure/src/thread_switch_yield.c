@@ -14,6 +14,7 @@
 #include <zephyr.h>
 #include <timestamp.h>  /* reading time */
 #include "utils.h"      /* PRINT () and other macros */
+#include <tc_util.h>
 
 /* <stdlib.h> is not supported */
 static int abs(int i)
@@ -108,5 +109,8 @@ void thread_switch_yield(void)
 			     timestamp / (iterations + helper_thread_iterations),
 			     SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
 							   (iterations + helper_thread_iterations)));
+		TC_PRINT_METRIC(thread_yield_ns,
+				SYS_CLOCK_HW_CYCLES_TO_NS_AVG(timestamp,
+							      (iterations + helper_thread_iterations)));
 	}
 }
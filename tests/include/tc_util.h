@@ -89,6 +89,22 @@
 		       (result) == TC_PASS ? "SUCCESSFUL" : "FAILED");	\
 	} while (0)
 
+/**
+ * @def TC_PRINT_METRIC
+ * @brief Report a measurement
+ *
+ * Print a ``SANITY_METRIC: <name>=<value>`` line, which sanitycheck
+ * records in its reports along with the footprint of the test case.
+ * Measurements in QEMU follow the load of the host unless QEMU counts
+ * instructions, so sanitycheck only compares them across runs, lower
+ * values being taken as better, when run with --qemu-icount.
+ *
+ * @a name is a C identifier naming the measurement, unique within the
+ * test case, @a value an unsigned integer.
+ */
+#define TC_PRINT_METRIC(name, value)					\
+	PRINT_DATA("SANITY_METRIC: " #name "=%u\n", (unsigned int)(value))
+
 #define TC_CMD_DEFINE(name)				\
 	int cmd_##name(int argc, char *argv[])		\
 	{						\